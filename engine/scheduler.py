@@ -3,16 +3,17 @@
 Core scheduler that takes in preferences and activity information and assembles them into an itinerary based on calculated scores and fit.
 '''
 
+from array import array
 from datetime import timedelta
 from models.activity import Activity
 from models.trip import Trip
 from models.preferences import UserPreferences
 from models.dayplan import DayPlan
 from engine.scorer import score_activity
-from utils.haversine import haversine_distance_km
+from utils.haversine import haversine_distance_km, haversine_distances_km
 
 
-def create_itinerary(trip, activities, prefs, locked_activities=None):
+def create_itinerary(trip, activities, prefs, locked_activities=None, distance_fn=None):
     '''
     Enhanced scheduler that:
     - Scores activities based on preferences
@@ -35,6 +36,11 @@ def create_itinerary(trip, activities, prefs, locked_activities=None):
             List of Activity class object containing the activities that the User has indicated they want to lock into the final itinerary
             Defaults to None.
 
+        distance_fn: *func*
+            Function taking two (lat, lon) locations and returning the distance between them in kilometers,
+            e.g. ItineraryManager.distance_km, which reads cached distances.
+            Defaults to None (haversine_distance_km).
+
     **Returns**
 
         itinerary: *list[DayPlan]*
@@ -44,6 +50,7 @@ def create_itinerary(trip, activities, prefs, locked_activities=None):
     # Initialize list of locked_activities based on passed argument; otherwise
     # initialize as empty list
     locked_activities = locked_activities or []
+    distance_fn = distance_fn or haversine_distance_km
 
     # Score all available activities using scorer
     scored_activities = [(score_activity(a, prefs), a) for a in activities]
@@ -113,8 +120,7 @@ def create_itinerary(trip, activities, prefs, locked_activities=None):
                 # Calculate proximity bonus if we have a location
                 proximity_bonus = 0
                 if last_location and activity.location:
-                    distance = haversine_distance_km(
-                        last_location, activity.location)
+                    distance = distance_fn(last_location, activity.location)
                     # Bonus for activities within 2km, penalty for far ones
                     if distance < 2:
                         proximity_bonus = 20 - \
@@ -170,26 +176,29 @@ def get_activity_clusters(activities, max_distance_km=2.0):
     '''
     # Initialize variables
     clusters = []
-    used = set()
 
-    # For each activity
-    for activity in activities:
-        if activity in used or not activity.location:
-            continue
+    # Activities that have a location and aren't in a cluster yet, in order
+    # (repeated activities only count once)
+    remaining = list(dict.fromkeys(a for a in activities if a.location))
 
-        # Start new cluster
-        cluster = [activity]
-        used.add(activity)
+    # Each remaining activity starts a new cluster
+    while remaining:
+        activity = remaining[0]
+        candidates = remaining[1:]
 
-        # Find nearby activities
-        for other in activities:
-            if other in used or not other.location:
-                continue
+        # Find nearby activities with one distance call over the candidates
+        distances = haversine_distances_km(
+            activity.location,
+            array("d", [other.location[0] for other in candidates]),
+            array("d", [other.location[1] for other in candidates]))
 
-            distance = haversine_distance_km(activity.location, other.location)
+        cluster = [activity]
+        remaining = []
+        for other, distance in zip(candidates, distances):
             if distance <= max_distance_km:
                 cluster.append(other)
-                used.add(other)
+            else:
+                remaining.append(other)
 
         if len(cluster) > 1:  # Only keep clusters with multiple activities
             clusters.append(cluster)
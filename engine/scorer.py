@@ -4,128 +4,152 @@ Algorithm for scoring each activity based on indicated user preferences.
 Takes in an Activity class object and a Preferences class object and outputs a numerical score for the activity.
 '''
 
+import heapq
+from collections import Counter
+from operator import itemgetter
+
 from models.activity import Activity
 from models.preferences import UserPreferences
 
 
-def score_activity(activity, prefs, already_scheduled=None):
+# Categories that complement each interest
+_COMPLEMENTARY_CATEGORIES = {
+    'museum': ['landmark', 'tour'],
+    'nature': ['tour'],
+    'food': [],  # Food is universal
+    'shopping': [],
+    'landmark': ['museum', 'tour'],
+    'tour': ['museum', 'landmark', 'nature'],
+    'entertainment': []
+}
+
+# Flattened (activity category, interest) -> bonus lookup, built once at import
+_COMPLEMENT_BONUS = {
+    (category, interest): 10
+    for interest, categories in _COMPLEMENTARY_CATEGORIES.items()
+    for category in categories
+}
+
+
+def _interest_bonus(category, interests):
     '''
-    Scoring that considers:
-    - User interests (primary factor)
-    - Cost preferences
-    - Schedule type
-    - Variety (penalize too many of same category)
-    - Duration flexibility
+    Score how well an activity category matches the user's interests.
 
     **Parameters**
 
-        activity: *Activity*
-            Activity to score
+        category: *str*
+            Lowercased activity category
 
-        prefs: *UserPreferences*
-            User preferences
+        interests: *frozenset[str]*
+            Lowercased user interests
 
-        already_scheduled: *list[Activity]*
-            Activities already in itinerary (for variety)
+    **Returns**
 
-    Returns:
+        bonus: *float*
+            40 for a direct match, 10 for a complementary category, otherwise 0
+    '''
+    # 1. USER INTEREST MATCH (30-40 points)
+    if category in interests:
+        return 40  # Increased from 30
 
-        score: *float*
-            Final score calculated for the activity
+    # Add small bonus for complementary categories
+    for interest in interests:
+        bonus = _COMPLEMENT_BONUS.get((category, interest))
+        if bonus is not None:
+            return bonus
+
+    return 0
+
+
+def _score_kernel(interest_bonus, duration, price, schedule_type, prioritize_cost,
+                  category_count):
     '''
-    already_scheduled = already_scheduled or []
+    Scoring formula over plain values. Everything that needs an Activity or
+    UserPreferences object is resolved by the caller, so this only does the
+    arithmetic.
 
-    # Normalize values
-    category = (activity.category or "").lower()
-    interests = [i.lower() for i in prefs.interests]
-    price = max(activity.price, 0)  # prevent negative price effects
+    **Parameters**
 
-    # Initialize score
-    score = 0.0
+        interest_bonus: *float*
+            Interest match bonus from _interest_bonus
 
-    # 1. USER INTEREST MATCH (30-40 points)
-    if activity.category.lower() in [i.lower() for i in prefs.interests]:
-        score += 40  # Increased from 30
-    else:
-        # Add small bonus for complementary categories
-        complementary = {
-            'museum': ['landmark', 'tour'],
-            'nature': ['tour'],
-            'food': [],  # Food is universal
-            'shopping': [],
-            'landmark': ['museum', 'tour'],
-            'tour': ['museum', 'landmark', 'nature'],
-            'entertainment': []
-        }
-
-        for interest in prefs.interests:
-            if activity.category.lower() in complementary.get(interest.lower(), []):
-                score += 10
-                break
+        duration: *float*
+            Activity duration in hours
+
+        price: *float*
+            Activity price
+
+        schedule_type: *str*
+            "relaxed", "balanced" or "packed"
+
+        prioritize_cost: *bool*
+            Whether the user prioritizes cost
+
+        category_count: *int*
+            Number of already scheduled activities in the same category
+
+    **Returns**
+
+        score: *float*
+            Final score calculated for the activity
+    '''
+    # Initialize score with the interest match
+    score = float(interest_bonus)
 
     # 2. COST FACTOR (-50 to +10 points)
 
     # If cost is listed as a priority
-    if prefs.prioritize_cost:
+    if prioritize_cost:
 
         # Strong preference for cheap activities
-        if activity.price == 0:
+        if price == 0:
             score += 15
 
-        elif activity.price < 20:
+        elif price < 20:
             score += 5
 
         # Heavy penalty for expensive activities
         else:
-            score -= activity.price * 0.8
+            score -= price * 0.8
 
     # Otherwise if cost is not listed as a priority
     else:
         # Small bonus for free activities
-        if activity.price == 0:
+        if price == 0:
             score += 5
 
         # Light penalty based on cost
         else:
-            score -= activity.price * 0.15
+            score -= price * 0.15
 
     # 3. SCHEDULE TYPE FIT (0-15 points)
-    if prefs.schedule_type == "relaxed":
-        if activity.duration <= 2:
+    if schedule_type == "relaxed":
+        if duration <= 2:
             score += 15
-        elif activity.duration >= 4:
+        elif duration >= 4:
             score -= 10  # Penalize long activities
-    elif prefs.schedule_type == "packed":
-        if activity.duration >= 2:
+    elif schedule_type == "packed":
+        if duration >= 2:
             score += 10
 
     # Otherwise if schedule type is balanced
     else:
-        if 1.5 <= activity.duration <= 3:
+        if 1.5 <= duration <= 3:
             score += 10
 
     # 4. VARIETY BONUS/PENALTY (-20 to +10 points)
     # Encourage diverse itinerary and penalize repetition
-    category_counts = {}
-
-    # Check what has already been scheduled
-    for scheduled in already_scheduled:
-        cat = (scheduled.category or "").lower()
-        category_counts[cat] = category_counts.get(cat, 0) + 1
-
-    current_cat = activity.category.lower()
-    count = category_counts.get(current_cat, 0)
 
     # Give a bonus for an activity of a new category
-    if count == 0:
+    if category_count == 0:
         score += 10
 
     # No penalty for a second activity of the same type
-    elif count == 1:
+    elif category_count == 1:
         score += 0  # Neutral
 
     # Penalize if the activity would be the third of the same type
-    elif count == 2:
+    elif category_count == 2:
         score -= 15
 
     # Give a strong penalty for 4+ activities of the same type
@@ -134,11 +158,11 @@ def score_activity(activity, prefs, already_scheduled=None):
 
     # 5. DURATION FLEXIBILITY (0-8 points)
     # Boost shorter activities as they are more flexible for scheduling
-    if activity.duration <= 1:
+    if duration <= 1:
         score += 8
-    elif activity.duration <= 2:
+    elif duration <= 2:
         score += 5
-    elif activity.duration <= 3:
+    elif duration <= 3:
         score += 2
     # No bonus or penalty for activities over 3 hours
 
@@ -146,9 +170,64 @@ def score_activity(activity, prefs, already_scheduled=None):
     return score
 
 
-def score_all_activities(activities, prefs, already_scheduled=None):
+def _score_activity_with_counts(activity, category, prefs, interest_bonus, sched_counts):
     '''
-    Score ALL activities and return sorted list based on their score.
+    Score an activity given its precomputed interest bonus and the category
+    counts of the current schedule. Shared by score_activity and
+    score_all_activities.
+
+    **Parameters**
+
+        activity: *Activity*
+            Activity to score
+
+        category: *str*
+            Lowercased category of the activity
+
+        prefs: *UserPreferences*
+            User preferences
+
+        interest_bonus: *float*
+            Interest match bonus from _interest_bonus
+
+        sched_counts: *dict[str, int]*
+            Lowercased category -> count for activities already in itinerary
+
+    **Returns**
+
+        score: *float*
+            Final score calculated for the activity
+    '''
+    return _score_kernel(interest_bonus, activity.duration, activity.price,
+                         prefs.schedule_type, prefs.prioritize_cost,
+                         sched_counts.get(category, 0))
+
+
+def _scheduled_counts(already_scheduled):
+    '''
+    Count the already scheduled activities per lowercased category.
+
+    **Parameters**
+
+        already_scheduled: *list[Activity]*
+            Activities already in itinerary
+
+    **Returns**
+
+        counts: *Counter[str]*
+            Lowercased category -> count
+    '''
+    return Counter((a.category or "").lower() for a in already_scheduled)
+
+
+def score_activity(activity, prefs, already_scheduled=None):
+    '''
+    Scoring that considers:
+    - User interests (primary factor)
+    - Cost preferences
+    - Schedule type
+    - Variety (penalize too many of same category)
+    - Duration flexibility
 
     **Parameters**
 
@@ -158,30 +237,85 @@ def score_all_activities(activities, prefs, already_scheduled=None):
         prefs: *UserPreferences*
             User preferences
 
+        already_scheduled: *list[Activity]*
+            Activities already in itinerary (for variety)
+
+    Returns:
+
+        score: *float*
+            Final score calculated for the activity
+    '''
+    already_scheduled = already_scheduled or []
+
+    # Normalize values
+    category = (activity.category or "").lower()
+
+    return _score_activity_with_counts(activity, category, prefs,
+                                       _interest_bonus(category, prefs._interest_set),
+                                       _scheduled_counts(already_scheduled))
+
+
+def score_all_activities(activities, prefs, already_scheduled=None, top_k=None):
+    '''
+    Score ALL activities and return sorted list based on their score.
+
+    **Parameters**
+
+        activities: *list[Activity]*
+            Activities to score
+
+        prefs: *UserPreferences*
+            User preferences
+
         already_scheduled: *list[Activity]*
             Activities already in itinerary (for variety)
             Defaults to None.
 
+        top_k: *int*
+            If given, only the top_k highest scoring activities are returned.
+            Defaults to None (all activities).
+
     Returns:
 
         scored: *list[tuple[float, Activity]]*
             List of (score, activity) tuples sorted by score (highest score first)
     '''
-    # Initialize empty list for storage
-    scored = []
+    already_scheduled = already_scheduled or []
+
+    # The schedule is the same for every candidate, so count its categories
+    # once up front instead of rescanning it per activity
+    sched_counts = _scheduled_counts(already_scheduled)
+
+    # The interest bonus depends only on the category, so compute it once per
+    # distinct category rather than once per activity
+    bonus_by_category = {}
+
+    # Pre-size the output list since every activity gets exactly one entry
+    scored = [None] * len(activities)
 
     # For all activities,
-    for activity in activities:
+    for i, activity in enumerate(activities):
+
+        # Look up (or compute) the interest bonus for the activity's category
+        category = (activity.category or "").lower()
+        if category not in bonus_by_category:
+            bonus_by_category[category] = _interest_bonus(category, prefs._interest_set)
 
         # Calculate a score for the activity
-        score = score_activity(activity, prefs, already_scheduled)
+        score = _score_activity_with_counts(activity, category, prefs,
+                                            bonus_by_category[category], sched_counts)
 
-        # Append a tuple of the activity and its score to the list of scored
+        # Store a tuple of the activity and its score in the list of scored
         # activities
-        scored.append((score, activity))
+        scored[i] = (score, activity)
+
+    # If only the best few are needed, select them with a heap rather than
+    # sorting the whole list
+    if top_k is not None:
+        return heapq.nlargest(top_k, scored, key=itemgetter(0))
 
     # Sort scored activities in descending order (highest to lowest)
-    scored.sort(reverse=True, key=lambda x: x[0])
+    scored.sort(reverse=True, key=itemgetter(0))
 
     # Return sorted list of scored activities
     return scored
@@ -202,17 +336,8 @@ def analyze_category_distribution(activities):
         distribution: *dict[str, int]*
             Dictionary mapping category -> count
     '''
-    # Initialize empty variable for storage
-    distribution = {}
-
-    # For each activity,
-    for activity in activities:
-
-        # Get the category it belows to
-        cat = activity.category.lower()
-
-        # Increment the counter for the category the activity belongs to
-        distribution[cat] = distribution.get(cat, 0) + 1
+    # Count activities per lowercased category
+    distribution = dict(Counter(map(str.lower, (a.category for a in activities))))
 
     # Return the calculated distribution of activities by category
     return distribution
@@ -249,8 +374,9 @@ def suggest_interest_balance(available_activities, user_interests):
             suggestions[interest] = f"Limited {interest} options ({count} activities)"
 
     # Suggest unexplored categories
+    interest_set = {i.lower() for i in user_interests}
     for category, count in distribution.items():
-        if category not in [i.lower() for i in user_interests] and count >= 5:
+        if category not in interest_set and count >= 5:
             suggestions[f"Consider {category}"] = f"{count} {category} activities available"
 
     # Return suggestion for each interest
@@ -7,7 +7,7 @@ Define
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Activity:
     '''
     This defines a class called "Activity" to store our things to do in our app.
@@ -32,6 +32,30 @@ class Activity:
     # Define "description" attribute to describe the activity
     description: str = ""
 
+    # Define method for comparing Activity class objects
+    def __eq__(self, other):
+        '''
+        Two activities are equal when all of their attributes match.
+        '''
+        if self is other:
+            return True
+        if type(other) is not Activity:
+            return NotImplemented
+        return (self.name == other.name
+                and self.category == other.category
+                and self.duration == other.duration
+                and self.price == other.price
+                and self.location == other.location
+                and self.description == other.description)
+
+    # Define method for hashing Activity class objects (used by sets/dicts)
+    def __hash__(self):
+        '''
+        Hash on a subset of the attributes compared in __eq__, so equal
+        activities always share a hash.
+        '''
+        return hash((self.name, self.category, self.duration))
+
     # Define method for converting Activity class objects to dictionaries
     def to_dict(self):
         '''
@@ -9,7 +9,7 @@ from typing import List
 from .activity import Activity
 
 
-@dataclass
+@dataclass(slots=True)
 class DayPlan:
     """
     Represents the plan for a single day in the itinerary.
@@ -52,6 +52,5 @@ class DayPlan:
         """
         return {
             "date": self.date.isoformat(),
-            "activities": [a.to_dict() for a in self.activities]
-
+            "activities": [a.to_dict() for a in self.activities],
         }
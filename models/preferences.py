@@ -1,7 +1,7 @@
 # Preferences Class
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import FrozenSet, List
 
 
 @dataclass
@@ -13,6 +13,10 @@ class UserPreferences:
     - Trip budget
     - Trip type (e.g. relaxed, balanced, packed)
     - Prioritized aspect (e.g.cost, distance)
+
+    Lowercased interests are also kept as a frozenset for O(1) membership
+    checks while scoring. The set is built at construction, so interests
+    should not be modified afterwards.
     '''
     # Define attributes
     interests: List[str]
@@ -26,3 +30,9 @@ class UserPreferences:
     prioritize_cost: bool = False
     prioritize_distance: bool = False
     include_opening_hours: bool = False
+
+    # Derived lookup set, not part of the constructor or equality
+    _interest_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._interest_set = frozenset(i.lower() for i in self.interests)
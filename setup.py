@@ -0,0 +1,16 @@
+# Build Script for Optional Compiled Extensions
+'''
+Builds the optional Cython speedups (currently utils/_haversine.pyx).
+Wandr runs fine without them. To build in place (needs Cython and a C
+compiler), run:
+
+    python setup.py build_ext --inplace
+'''
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="wandr",
+    ext_modules=cythonize(["utils/_haversine.pyx"], language_level=3),
+)
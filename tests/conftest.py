@@ -0,0 +1,233 @@
+# Shared Test Fixtures
+
+import pytest
+import random
+from datetime import date
+from models.activity import Activity
+from models.trip import Trip
+from models.preferences import UserPreferences
+from engine.scheduler import create_itinerary
+
+
+# ============================================================================
+# CSV FIXTURES
+# ============================================================================
+
+@pytest.fixture(scope="session")
+def csv_file(tmp_path_factory):
+    '''
+    Factory fixture that writes CSV content to a file once per test session
+    and returns its path. Files are keyed by content, so repeated requests
+    for the same CSV text reuse the file already on disk.
+    '''
+    csv_dir = tmp_path_factory.mktemp("csv")
+    written = {}
+
+    def _write(content: str):
+        if content not in written:
+            path = csv_dir / f"test_{len(written)}.csv"
+            path.write_text(content, encoding="utf-8")
+            written[content] = path
+        return written[content]
+
+    return _write
+
+
+# ============================================================================
+# SCHEDULER FIXTURES - Reusable trips, activities and preferences
+# Read-only fixtures are session-scoped and built once per run; balanced_prefs
+# stays function-scoped because some tests modify it
+# ============================================================================
+
+# Activities are immutable, so these are built once at import time and
+# shared; the fixtures hand out fresh lists of the same Activity objects
+SAMPLE_ACTIVITIES = (
+    Activity("Museum A", "museum", 2.0, 20.0, (40.7128, -74.0060), "Art museum"),
+    Activity("Museum B", "museum", 3.0, 25.0, (40.7200, -74.0100), "History museum"),
+    Activity("Park", "nature", 1.0, 0.0, (40.7580, -73.9855), "City park"),
+    Activity("Restaurant", "food", 1.5, 30.0, (40.7489, -73.9680), "Fine dining"),
+    Activity("Tour", "tour", 2.0, 40.0, (40.7614, -73.9776), "City tour"),
+    Activity("Shopping", "shopping", 2.5, 50.0, (40.7589, -73.9787), "Shopping district"),
+    Activity("Theater", "entertainment", 3.0, 100.0, (40.7590, -73.9845), "Broadway show"),
+    Activity("Free Walk", "nature", 1.5, 0.0, (40.7061, -73.9969), "Historic walk"),
+)
+
+SAMPLE_ACTIVITIES_NO_LOCATION = (
+    Activity("Museum", "museum", 2.0, 20.0, None, "Museum"),
+    Activity("Park", "nature", 1.0, 0.0, None, "Park"),
+    Activity("Restaurant", "food", 1.5, 30.0, None, "Restaurant"),
+)
+
+
+@pytest.fixture(scope="session")
+def sample_activities():
+    '''
+    Sample activities with varied properties
+    '''
+    return list(SAMPLE_ACTIVITIES)
+
+
+@pytest.fixture(scope="session")
+def sample_activities_no_location():
+    '''
+    Activities without location data
+    '''
+    return list(SAMPLE_ACTIVITIES_NO_LOCATION)
+
+
+@pytest.fixture(scope="session")
+def basic_trip():
+    '''
+    Simple 3-day trip
+    '''
+    return Trip(
+        destination="New York",
+        start_date=date(2025, 6, 1),
+        end_date=date(2025, 6, 3),
+        budget=500,
+        interests=["museum", "food"]
+    )
+
+
+@pytest.fixture(scope="session")
+def single_day_trip():
+    '''
+    Single day trip
+    '''
+    return Trip(
+        destination="City",
+        start_date=date(2025, 6, 1),
+        end_date=date(2025, 6, 1),
+        budget=100,
+        interests=["museum"]
+    )
+
+
+@pytest.fixture(scope="session")
+def long_trip():
+    '''
+    Extended 14-day trip
+    '''
+    return Trip(
+        destination="City",
+        start_date=date(2025, 6, 1),
+        end_date=date(2025, 6, 14),  # 14 days
+        budget=2000,
+        interests=["museum"]
+    )
+
+
+@pytest.fixture(scope="session")
+def varied_long_activities():
+    '''
+    Many activities with varied categories, durations and prices for filling
+    long trips. Generated from a fixed seed, so every run gets the same set.
+    '''
+    rng = random.Random(42)
+    categories = ["museum", "nature", "food", "tour", "shopping"]
+
+    return [
+        Activity(
+            f"Activity {i}",
+            rng.choice(categories),
+            round(rng.uniform(0.5, 4.0), 1),
+            round(rng.uniform(0.0, 100.0), 2),
+            None,
+            f"Activity {i}")
+        for i in range(50)
+    ]
+
+
+def make_balanced_prefs():
+    '''
+    Build the balanced schedule preferences used across the scheduler tests
+    '''
+    return UserPreferences(
+        interests=["museum", "food"],
+        budget=500,
+        schedule_type="balanced",
+        max_hours_per_day=8.0
+    )
+
+
+@pytest.fixture
+def balanced_prefs():
+    '''
+    Balanced schedule preferences
+    '''
+    return make_balanced_prefs()
+
+
+@pytest.fixture(scope="session")
+def relaxed_prefs():
+    '''
+    Relaxed schedule preferences
+    '''
+    return UserPreferences(
+        interests=["nature"],
+        budget=200,
+        schedule_type="relaxed",
+        max_hours_per_day=5.0
+    )
+
+
+@pytest.fixture(scope="session")
+def packed_prefs():
+    '''
+    Packed schedule preferences
+    '''
+    return UserPreferences(
+        interests=["museum", "food", "shopping"],
+        budget=1000,
+        schedule_type="packed",
+        max_hours_per_day=10.0
+    )
+
+
+@pytest.fixture(scope="session")
+def default_itinerary(basic_trip, sample_activities):
+    '''
+    Itinerary for basic_trip with balanced preferences, generated once and
+    shared by the tests that only read it
+    '''
+    return create_itinerary(
+        basic_trip,
+        sample_activities,
+        make_balanced_prefs())
+
+
+# ============================================================================
+# PREFERENCE CASES - Table of UserPreferences constructor arguments
+# Any test that takes a prefs_case argument runs once per entry
+# ============================================================================
+
+_PREFS_CASES = {
+    "basic": {"interests": ["museum"], "budget": 300, "schedule_type": "balanced"},
+    "relaxed": {"interests": ["nature"], "budget": 400, "schedule_type": "relaxed"},
+    "packed": {"interests": ["museum", "food", "shopping"], "budget": 1000, "schedule_type": "packed"},
+    "single_interest": {"interests": ["food"], "budget": 300, "schedule_type": "relaxed"},
+    "multiple_interests": {"interests": ["museum", "nature", "food", "shopping"], "budget": 800, "schedule_type": "balanced"},
+    "empty_interests": {"interests": [], "budget": 500, "schedule_type": "balanced"},
+    "case_sensitive_interests": {"interests": ["Museum", "FOOD", "nature"], "budget": 500, "schedule_type": "balanced"},
+    "zero_budget": {"interests": ["nature"], "budget": 0, "schedule_type": "relaxed", "prioritize_cost": True},
+    "large_budget": {"interests": ["museum", "food", "entertainment"], "budget": 5000, "schedule_type": "packed"},
+    "prioritize_cost": {"interests": ["museum"], "budget": 500, "schedule_type": "balanced", "prioritize_cost": True},
+    "prioritize_distance": {"interests": ["museum"], "budget": 500, "schedule_type": "balanced", "prioritize_distance": True},
+    "include_opening_hours": {"interests": ["museum"], "budget": 500, "schedule_type": "balanced", "include_opening_hours": True},
+    "all_flags": {"interests": ["museum"], "budget": 500, "schedule_type": "balanced",
+                  "prioritize_cost": True, "prioritize_distance": True, "include_opening_hours": True},
+    "custom_hours": {"interests": ["museum"], "budget": 500, "schedule_type": "balanced",
+                     "min_hours_per_day": 2.0, "max_hours_per_day": 5.0},
+    "fractional_hours": {"interests": ["museum"], "budget": 500, "schedule_type": "balanced",
+                         "min_hours_per_day": 2.5, "max_hours_per_day": 6.5},
+    "extreme_hours": {"interests": ["museum"], "budget": 500, "schedule_type": "balanced",
+                      "min_hours_per_day": 1.0, "max_hours_per_day": 12.0},
+}
+
+
+def pytest_generate_tests(metafunc):
+    '''
+    Parametrize any test requesting prefs_case with every entry in _PREFS_CASES
+    '''
+    if "prefs_case" in metafunc.fixturenames:
+        metafunc.parametrize("prefs_case", list(_PREFS_CASES.values()), ids=list(_PREFS_CASES))
@@ -1,6 +1,5 @@
 # Unit Tests for Activity Class
 
-import pytest
 from models.activity import Activity
 
 
@@ -91,6 +90,37 @@ def test_activity_inequality():
     assert a1 != a2
 
 
+def test_activity_hash_matches_equality():
+    '''
+    Test that equal activities hash the same so sets deduplicate them
+    '''
+    a1 = Activity("Museum", "museum", 2.0, 20.0, (41.0, -87.0), "Great place")
+    a2 = Activity("Museum", "museum", 2.0, 20.0, (41.0, -87.0), "Great place")
+    a3 = Activity("Museum", "museum", 2.0, 25.0, (41.0, -87.0), "Great place")
+
+    assert hash(a1) == hash(a2)
+    assert len({a1, a2, a3}) == 2
+
+
+def test_activity_not_equal_to_other_types():
+    '''
+    Test that activities never compare equal to non-Activity objects
+    '''
+    a = Activity("Museum", "museum", 2.0, 20.0)
+
+    assert a != ("Museum", "museum", 2.0, 20.0, None, "")
+    assert a != "Museum"
+
+
+def test_activity_uses_slots():
+    '''
+    Test that Activity objects don't carry a per-instance __dict__
+    '''
+    a = Activity("Museum", "museum", 2.0, 20.0)
+
+    assert not hasattr(a, "__dict__")
+
+
 def test_activity_with_zero_price():
     '''
     Test that activities can have zero price (free activities)
@@ -1,6 +1,5 @@
 # Unit Testing for DayPlan
 
-import pytest
 from datetime import date
 from models.dayplan import DayPlan
 from models.activity import Activity
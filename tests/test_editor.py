@@ -0,0 +1,352 @@
+# Unit Tests for Itinerary Manager
+
+import pytest
+import json
+from datetime import date
+from models.activity import Activity
+from engine.scheduler import create_itinerary
+from utils.editor import ItineraryManager, interactive_refinement_cli
+from utils.haversine import haversine_distance_km
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def manager(basic_trip, sample_activities, balanced_prefs):
+    '''
+    Itinerary manager over the sample activities
+    '''
+    return ItineraryManager(basic_trip, sample_activities, balanced_prefs)
+
+
+# ============================================================================
+# NAME INDEX TESTS
+# ============================================================================
+
+def test_name_index_case_insensitive(manager, sample_activities):
+    '''
+    Test that activities can be found by lowercased name
+    '''
+    for activity in sample_activities:
+        assert manager._name_index[activity.name.lower()] is activity
+
+
+def test_name_index_first_duplicate_wins(basic_trip, balanced_prefs):
+    '''
+    Test that the first activity is kept when names repeat
+    '''
+    first = Activity("Park", "nature", 1.0, 0.0, None, "First")
+    second = Activity("PARK", "nature", 2.0, 0.0, None, "Second")
+    manager = ItineraryManager(basic_trip, [first, second], balanced_prefs)
+
+    assert manager._name_index["park"] is first
+
+
+# ============================================================================
+# LOCK TESTS
+# ============================================================================
+
+def test_lock_activity_specific_day(manager, sample_activities):
+    '''
+    Test that day locks are recorded in both directions
+    '''
+    activity = sample_activities[0]
+    day = date(2025, 6, 2)
+
+    assert manager.lock_activity(activity, specific_day=day)
+
+    assert activity in manager.locked_activities
+    assert manager.locked_per_day[day] == [activity]
+    assert manager.activity_day[activity] == day
+
+
+def test_lock_activity_moves_day(manager, sample_activities):
+    '''
+    Test that re-locking an activity to a new day moves it off the old day
+    '''
+    activity = sample_activities[0]
+
+    manager.lock_activity(activity, specific_day=date(2025, 6, 1))
+    manager.lock_activity(activity, specific_day=date(2025, 6, 3))
+
+    assert manager.locked_per_day[date(2025, 6, 1)] == []
+    assert manager.locked_per_day[date(2025, 6, 3)] == [activity]
+    assert manager.activity_day[activity] == date(2025, 6, 3)
+
+
+def test_unlock_activity_clears_day_lock(manager, sample_activities):
+    '''
+    Test that unlocking removes the activity from its locked day
+    '''
+    activity = sample_activities[0]
+    day = date(2025, 6, 2)
+    manager.lock_activity(activity, specific_day=day)
+
+    assert manager.unlock_activity(activity)
+
+    assert activity not in manager.locked_activities
+    assert manager.locked_per_day[day] == []
+    assert activity not in manager.activity_day
+
+
+def test_unlock_activity_not_locked(manager, sample_activities):
+    '''
+    Test that unlocking an activity that isn't locked fails
+    '''
+    assert not manager.unlock_activity(sample_activities[0])
+
+
+# ============================================================================
+# SWAP TESTS
+# ============================================================================
+
+def test_swap_activity_keeps_position(manager):
+    '''
+    Test that the new activity takes the old activity's place in the day
+    '''
+    manager.regenerate_itinerary(create_itinerary)
+    day = manager.current_itinerary[0]
+    old = day.activities[0]
+    new = Activity("Gallery", "museum", 1.0, 10.0, None, "Small gallery")
+    before = list(day.activities)
+
+    assert manager.swap_activity(old, new, 0)
+
+    assert day.activities == [new] + before[1:]
+
+
+def test_swap_activity_not_on_day(manager, sample_activities):
+    '''
+    Test that swapping out an activity that isn't on the day fails
+    '''
+    manager.regenerate_itinerary(create_itinerary)
+    day = manager.current_itinerary[0]
+    absent = next(a for a in sample_activities if a not in day.activities)
+    before = list(day.activities)
+
+    assert not manager.swap_activity(absent, sample_activities[0], 0)
+    assert day.activities == before
+
+
+def test_swap_activity_invalid_day(manager, sample_activities):
+    '''
+    Test that swapping on a day past the end of the itinerary fails
+    '''
+    manager.regenerate_itinerary(create_itinerary)
+
+    assert not manager.swap_activity(
+        sample_activities[0], sample_activities[1], len(manager.current_itinerary))
+
+
+# ============================================================================
+# SAVE TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("use_orjson", [False, True])
+def test_save_itinerary_state(manager, sample_activities, tmp_path,
+                              monkeypatch, use_orjson):
+    '''
+    Test that the saved state file is valid JSON with locks and itinerary,
+    with both the orjson and standard library writers
+    '''
+    if use_orjson:
+        monkeypatch.setattr("utils.editor.orjson",
+                            pytest.importorskip("orjson"), raising=False)
+    monkeypatch.setattr("utils.editor.ORJSON_AVAILABLE", use_orjson)
+
+    manager.regenerate_itinerary(create_itinerary)
+    manager.lock_activity(sample_activities[0])
+    filename = tmp_path / "state.json"
+
+    manager.save_itinerary_state(filename)
+
+    with open(filename, encoding="utf-8") as f:
+        state = json.load(f)
+
+    assert state['destination'] == "New York"
+    assert state['start_date'] == "2025-06-01"
+    assert state['locked_activities'] == [sample_activities[0].name]
+    assert len(state['itinerary']) == len(manager.current_itinerary)
+
+
+# ============================================================================
+# DISTANCE CACHE TESTS
+# ============================================================================
+
+def test_distance_km_matches_haversine(manager, sample_activities):
+    '''
+    Test that cached distances match direct haversine calculations
+    '''
+    for a in sample_activities:
+        for b in sample_activities:
+            assert manager.distance_km(a.location, b.location) == pytest.approx(
+                haversine_distance_km(a.location, b.location))
+
+
+def test_distance_km_unknown_location(manager, sample_activities):
+    '''
+    Test that locations that aren't activity locations are computed directly
+    and never get a cached row
+    '''
+    origin = sample_activities[0].location
+    elsewhere = (51.5074, -0.1278)
+
+    assert manager.distance_km(origin, elsewhere) == pytest.approx(
+        haversine_distance_km(origin, elsewhere))
+    assert manager.distance_km(elsewhere, origin) == pytest.approx(
+        haversine_distance_km(elsewhere, origin))
+
+    assert manager._distance_rows == {}
+
+
+def test_distance_km_caches_one_row_per_origin(manager, sample_activities):
+    '''
+    Test that only the origins looked up get a row, covering every location
+    '''
+    origin = sample_activities[0].location
+
+    for activity in sample_activities:
+        manager.distance_km(origin, activity.location)
+
+    assert list(manager._distance_rows) == [origin]
+    assert len(manager._distance_rows[origin]) == len(manager._location_index)
+
+
+def test_distance_rows_reused_across_regenerations(manager, sample_activities,
+                                                    monkeypatch):
+    '''
+    Test that rows are computed lazily and reused by later regenerations
+    '''
+    monkeypatch.setattr("utils.editor.COMPILED_AVAILABLE", False)
+    assert manager._location_index is None
+    assert manager._distance_rows == {}
+
+    manager.regenerate_itinerary(create_itinerary)
+    rows = dict(manager._distance_rows)
+
+    manager.exclude_activity(sample_activities[0])
+    manager.regenerate_itinerary(create_itinerary)
+
+    assert rows
+    assert len(rows) < len(manager._location_index)
+    for origin, row in rows.items():
+        assert manager._distance_rows[origin] is row
+
+
+def test_distance_km_no_locations(basic_trip, sample_activities_no_location,
+                                  balanced_prefs):
+    '''
+    Test that activities without locations give an empty location index
+    '''
+    manager = ItineraryManager(
+        basic_trip, sample_activities_no_location, balanced_prefs)
+    manager._index_locations()
+
+    assert manager._location_index == {}
+    assert len(manager._lats) == len(manager._lons) == 0
+
+
+# ============================================================================
+# REGENERATION TESTS
+# ============================================================================
+
+def test_regenerate_matches_create_itinerary(manager, basic_trip,
+                                             sample_activities, balanced_prefs):
+    '''
+    Test that regenerating with the cached distances gives the same itinerary
+    as scheduling with direct haversine distances
+    '''
+    itinerary = manager.regenerate_itinerary(create_itinerary)
+    expected = create_itinerary(basic_trip, sample_activities, balanced_prefs)
+
+    assert [day.activities for day in itinerary] == [
+        day.activities for day in expected]
+
+
+def test_regenerate_four_argument_scheduler(manager, sample_activities):
+    '''
+    Test that schedulers without a distance_fn argument still work
+    '''
+    calls = []
+
+    def scheduler(trip, activities, prefs, locked_activities):
+        calls.append(locked_activities)
+        return create_itinerary(trip, activities, prefs, locked_activities)
+
+    manager.lock_activity(sample_activities[0])
+    itinerary = manager.regenerate_itinerary(scheduler)
+
+    assert calls == [[sample_activities[0]]]
+    assert itinerary is manager.current_itinerary
+    assert any(sample_activities[0] in day.activities for day in itinerary)
+
+
+def test_regenerate_passes_distance_fn(manager, monkeypatch):
+    '''
+    Test that schedulers taking distance_fn are given the cached distances
+    '''
+    monkeypatch.setattr("utils.editor.COMPILED_AVAILABLE", False)
+    received = {}
+
+    def scheduler(trip, activities, prefs, locked_activities, **kwargs):
+        received.update(kwargs)
+        return []
+
+    manager.regenerate_itinerary(scheduler)
+
+    assert received == {'distance_fn': manager.distance_km}
+
+
+def test_regenerate_compiled_skips_distance_fn(manager, monkeypatch):
+    '''
+    Test that the cached distances aren't used with the compiled extension
+    '''
+    monkeypatch.setattr("utils.editor.COMPILED_AVAILABLE", True)
+    received = {}
+
+    def scheduler(trip, activities, prefs, locked_activities, **kwargs):
+        received.update(kwargs)
+        return []
+
+    manager.regenerate_itinerary(scheduler)
+
+    assert received == {}
+
+
+def test_regenerate_reports_unscheduled_locks(basic_trip, sample_activities,
+                                              balanced_prefs, capsys):
+    '''
+    Test that locked activities too long for any day are reported as missing
+    '''
+    too_long = Activity("Marathon Tour", "tour", 12.0, 10.0, None, "All day")
+    manager = ItineraryManager(
+        basic_trip, sample_activities + [too_long], balanced_prefs)
+    manager.lock_activity(too_long)
+
+    itinerary = manager.regenerate_itinerary(create_itinerary)
+
+    assert all(too_long not in day.activities for day in itinerary)
+    assert "Marathon Tour ($10.0, 12.0h)" in capsys.readouterr().out
+
+
+# ============================================================================
+# CLI TESTS
+# ============================================================================
+
+def test_refinement_cli_view_and_exit(manager, sample_activities,
+                                      monkeypatch, capsys):
+    '''
+    Test viewing the itinerary and lock status, then exiting without saving
+    '''
+    choices = iter(["1", "7", "9"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(choices))
+
+    interactive_refinement_cli(manager, create_itinerary)
+
+    out = capsys.readouterr().out
+    assert out.count("ITINERARY REFINEMENT MENU") == 3
+    assert "📅 Day 1 - 2025-06-01" in out
+    assert "🔒 Locked: 0" in out
+    assert "Exiting without saving" in out
@@ -1,7 +1,15 @@
 # Unit Tests for Haversine Distance Calculator
 
 import pytest
-from utils.haversine import haversine_distance_km
+import math
+from array import array
+from utils.haversine import (
+    haversine_distance_km,
+    haversine_distances_km,
+    py_haversine_distance_km,
+    py_haversine_distances_km,
+    COMPILED_AVAILABLE
+)
 
 
 def test_haversine_same_location():
@@ -222,3 +230,62 @@ def test_haversine_real_world_cities():
     distance = haversine_distance_km(cities['Paris'], cities['Sydney'])
 
     assert 16500 < distance < 17500
+
+
+@pytest.mark.skipif(not COMPILED_AVAILABLE,
+                    reason="compiled haversine extension not built")
+@pytest.mark.parametrize("a,b", [
+    ((48.8566, 2.3522), (51.5074, -0.1278)),
+    ((40.7128, -74.0060), (34.0522, -118.2437)),
+    ((35.6762, 139.6503), (-33.8688, 151.2093)),
+    ((0.0, 0.0), (0.0, 180.0)),
+], ids=["paris_london", "nyc_la", "tokyo_sydney", "antipodal"])
+def test_haversine_compiled_matches_python(a, b):
+    '''
+    Test that the compiled extension gives the same distances as the pure
+    Python version
+    '''
+    assert haversine_distance_km(a, b) == pytest.approx(
+        py_haversine_distance_km(a, b), rel=1e-12)
+
+
+def test_haversine_distances_matches_pairwise():
+    '''
+    Test that one-to-many distances match the single-pair function
+    '''
+    paris = (48.8566, 2.3522)
+    lats = array("d", [51.5074, 40.7128, 48.8566])
+    lons = array("d", [-0.1278, -74.0060, 2.3522])
+
+    distances = haversine_distances_km(paris, lats, lons)
+
+    assert len(distances) == 3
+    for i in range(3):
+        assert distances[i] == pytest.approx(
+            haversine_distance_km(paris, (lats[i], lons[i])))
+
+
+def test_haversine_distances_missing_coordinates():
+    '''
+    Test that NaN coordinates give NaN distances instead of raising
+    '''
+    distances = haversine_distances_km(
+        (48.8566, 2.3522), array("d", [math.nan]), array("d", [math.nan]))
+
+    assert math.isnan(distances[0])
+
+
+@pytest.mark.skipif(not COMPILED_AVAILABLE,
+                    reason="compiled haversine extension not built")
+def test_haversine_distances_compiled_matches_python():
+    '''
+    Test that the compiled one-to-many distances match pure Python
+    '''
+    origin = (40.7128, -74.0060)
+    lats = array("d", [34.0522, 51.5074, -33.8688])
+    lons = array("d", [-118.2437, -0.1278, 151.2093])
+
+    compiled = haversine_distances_km(origin, lats, lons)
+    python = py_haversine_distances_km(origin, lats, lons)
+
+    assert list(compiled) == pytest.approx(list(python), rel=1e-12)
@@ -1,6 +1,7 @@
 # Unit Tests for Scheduling Engine
 
 import pytest
+from collections import namedtuple
 from datetime import date, timedelta
 from models.activity import Activity
 from models.trip import Trip
@@ -10,106 +11,31 @@ from engine.scheduler import (
     get_activity_clusters,
     estimate_travel_time
 )
+from utils.haversine import haversine_distance_km
+
+pytestmark = pytest.mark.scheduler
 
 
 # ============================================================================
-# FIXTURES - Reusable test data
+# HELPERS
 # ============================================================================
 
-@pytest.fixture
-def sample_activities():
-    '''
-    Sample activities with varied properties
-    '''
-    return [
-        Activity("Museum A", "museum", 2.0, 20.0, (40.7128, -74.0060), "Art museum"),
-        Activity("Museum B", "museum", 3.0, 25.0, (40.7200, -74.0100), "History museum"),
-        Activity("Park", "nature", 1.0, 0.0, (40.7580, -73.9855), "City park"),
-        Activity("Restaurant", "food", 1.5, 30.0, (40.7489, -73.9680), "Fine dining"),
-        Activity("Tour", "tour", 2.0, 40.0, (40.7614, -73.9776), "City tour"),
-        Activity("Shopping", "shopping", 2.5, 50.0, (40.7589, -73.9787), "Shopping district"),
-        Activity("Theater", "entertainment", 3.0, 100.0, (40.7590, -73.9845), "Broadway show"),
-        Activity("Free Walk", "nature", 1.5, 0.0, (40.7061, -73.9969), "Historic walk"),
-    ]
-
-
-@pytest.fixture
-def sample_activities_no_location():
-    '''
-    Activities without location data
-    '''
-    return [
-        Activity("Museum", "museum", 2.0, 20.0, None, "Museum"),
-        Activity("Park", "nature", 1.0, 0.0, None, "Park"),
-        Activity("Restaurant", "food", 1.5, 30.0, None, "Restaurant"),
-    ]
-
-
-@pytest.fixture
-def basic_trip():
-    '''
-    Simple 3-day trip
-    '''
-    return Trip(
-        destination="New York",
-        start_date=date(2025, 6, 1),
-        end_date=date(2025, 6, 3),
-        budget=500,
-        interests=["museum", "food"]
-    )
-
-
-@pytest.fixture
-def single_day_trip():
-    '''
-    Single day trip
-    '''
-    return Trip(
-        destination="City",
-        start_date=date(2025, 6, 1),
-        end_date=date(2025, 6, 1),
-        budget=100,
-        interests=["museum"]
-    )
-
-
-@pytest.fixture
-def balanced_prefs():
-    '''
-    Balanced schedule preferences
-    '''
-    return UserPreferences(
-        interests=["museum", "food"],
-        budget=500,
-        schedule_type="balanced",
-        max_hours_per_day=8.0
-    )
+ItineraryTotals = namedtuple(
+    "ItineraryTotals", ["cost", "activity_count", "activities"])
 
 
-@pytest.fixture
-def relaxed_prefs():
+def itinerary_totals(itinerary):
     '''
-    Relaxed schedule preferences
+    Walk an itinerary once and return its total cost, the number of scheduled
+    activities, and a flat list of the scheduled activities
     '''
-    return UserPreferences(
-        interests=["nature"],
-        budget=200,
-        schedule_type="relaxed",
-        max_hours_per_day=5.0
-    )
-
+    cost = 0.0
+    activities = []
+    for day in itinerary:
+        cost += day.total_cost()
+        activities.extend(day.activities)
 
-@pytest.fixture
-def packed_prefs():
-    '''
-    Packed schedule preferences
-    '''
-    return UserPreferences(
-        interests=["museum", "food", "shopping"],
-        budget=1000,
-        schedule_type="packed",
-        max_hours_per_day=10.0
-    )
+    return ItineraryTotals(cost, len(activities), activities)
 
 
 # ============================================================================
@@ -117,33 +43,32 @@ def packed_prefs():
 # ============================================================================
 
 def test_scheduler_creates_correct_number_of_days(
-        basic_trip, sample_activities, balanced_prefs):
+        basic_trip, default_itinerary):
     '''
     Test that scheduler creates one DayPlan per trip day
     '''
-    itinerary = create_itinerary(basic_trip, sample_activities, balanced_prefs)
+    itinerary = default_itinerary
 
     assert len(itinerary) == basic_trip.trip_length()
     assert len(itinerary) == 3
 
 
 def test_scheduler_respects_daily_hour_limit(
-        basic_trip, sample_activities, balanced_prefs):
+        default_itinerary, balanced_prefs):
     '''
     Test that no day exceeds max_hours_per_day
     '''
-    itinerary = create_itinerary(basic_trip, sample_activities, balanced_prefs)
+    itinerary = default_itinerary
 
     for day in itinerary:
         assert day.total_duration() <= balanced_prefs.max_hours_per_day
 
 
-def test_scheduler_no_duplicate_activities(
-        basic_trip, sample_activities, balanced_prefs):
+def test_scheduler_no_duplicate_activities(default_itinerary):
     '''
     Test that activities aren't scheduled multiple times
     '''
-    itinerary = create_itinerary(basic_trip, sample_activities, balanced_prefs)
+    itinerary = default_itinerary
 
     seen = set()
     for day in itinerary:
@@ -166,8 +91,7 @@ def test_scheduler_respects_budget(basic_trip, sample_activities):
 
     itinerary = create_itinerary(basic_trip, sample_activities, prefs)
 
-    total_cost = sum(day.total_cost() for day in itinerary)
-    assert total_cost <= basic_trip.budget
+    assert itinerary_totals(itinerary).cost <= basic_trip.budget
 
 
 def test_scheduler_with_single_day_trip(
@@ -186,31 +110,6 @@ def test_scheduler_with_single_day_trip(
     assert itinerary[0].date == single_day_trip.start_date
 
 
-def test_scheduler_with_no_activities(basic_trip, balanced_prefs):
-    '''
-    Test scheduler with empty activity list
-    '''
-    itinerary = create_itinerary(basic_trip, [], balanced_prefs)
-
-    assert len(itinerary) == basic_trip.trip_length()
-    for day in itinerary:
-        assert len(day.activities) == 0
-
-
-def test_scheduler_with_single_activity(basic_trip, balanced_prefs):
-    '''
-    Test scheduler with only one activity available
-    '''
-    activities = [Activity("Museum", "museum", 2.0, 20.0,
-                           (40.7128, -74.0060), "Museum")]
-
-    itinerary = create_itinerary(basic_trip, activities, balanced_prefs)
-
-    # Should only appear once across all days
-    total_activities = sum(len(day.activities) for day in itinerary)
-    assert total_activities == 1
-
-
 # ============================================================================
 # SCHEDULE TYPE TESTS
 # ============================================================================
@@ -246,8 +145,8 @@ def test_scheduler_packed_maximizes_activities(
     relaxed_itinerary = create_itinerary(
         basic_trip, sample_activities, relaxed_prefs)
 
-    packed_total = sum(len(day.activities) for day in packed_itinerary)
-    relaxed_total = sum(len(day.activities) for day in relaxed_itinerary)
+    packed_total = itinerary_totals(packed_itinerary).activity_count
+    relaxed_total = itinerary_totals(relaxed_itinerary).activity_count
 
     # Packed should schedule more activities overall
     assert packed_total >= relaxed_total
@@ -271,12 +170,9 @@ def test_scheduler_groups_nearby_activities(
             locations = [a.location for a in day.activities if a.location]
             if len(locations) >= 2:
                 # Calculate average distance between consecutive activities
-                from utils.haversine import haversine_distance_km
-                distances = []
-                for i in range(len(locations) - 1):
-                    dist = haversine_distance_km(
-                        locations[i], locations[i + 1])
-                    distances.append(dist)
+                distances = [
+                    haversine_distance_km(locations[i], locations[i + 1])
+                    for i in range(len(locations) - 1)]
                 avg_distance = sum(distances) / len(distances)
 
                 # Activities should generally be within 5km of each other
@@ -298,7 +194,7 @@ def test_scheduler_without_locations(
     # Should still create valid itinerary
     assert len(itinerary) == basic_trip.trip_length()
     # Should have some activities scheduled
-    total_activities = sum(len(day.activities) for day in itinerary)
+    total_activities = itinerary_totals(itinerary).activity_count
     assert total_activities > 0
 
 
@@ -322,9 +218,7 @@ def test_scheduler_respects_locked_activities(
         locked_activities=locked)
 
     # Check that both locked activities appear
-    all_scheduled = []
-    for day in itinerary:
-        all_scheduled.extend(day.activities)
+    all_scheduled = {a for day in itinerary for a in day.activities}
 
     assert museum in all_scheduled, "Locked museum not in itinerary"
     assert park in all_scheduled, "Locked park not in itinerary"
@@ -353,9 +247,7 @@ def test_scheduler_prioritizes_locked_activities(
         locked_activities=[expensive_activity])
 
     # Expensive activity should appear despite budget constraints
-    all_scheduled = []
-    for day in itinerary:
-        all_scheduled.extend(day.activities)
+    all_scheduled = {a for day in itinerary for a in day.activities}
 
     assert expensive_activity in all_scheduled
 
@@ -400,7 +292,7 @@ def test_scheduler_with_no_matching_interests(basic_trip, sample_activities):
     itinerary = create_itinerary(basic_trip, sample_activities, prefs)
 
     # Should still schedule some activities
-    total_activities = sum(len(day.activities) for day in itinerary)
+    total_activities = itinerary_totals(itinerary).activity_count
     assert total_activities > 0
 
 # ============================================================================
@@ -408,72 +300,52 @@ def test_scheduler_with_no_matching_interests(basic_trip, sample_activities):
 # ============================================================================
 
 
-def test_scheduler_with_very_long_trip():
+def test_scheduler_with_very_long_trip(long_trip, varied_long_activities):
     '''
     Test scheduler with extended trip duration
     '''
-    long_trip = Trip(
-        destination="City",
-        start_date=date(2025, 6, 1),
-        end_date=date(2025, 6, 14),  # 14 days
-        budget=2000,
-        interests=["museum"]
-    )
-
-    activities = [
-        Activity(f"Activity {i}", "museum", 2.0, 20.0, None, f"Activity {i}")
-        for i in range(50)  # Many activities
-    ]
-
     prefs = UserPreferences(
         interests=["museum"],
         budget=2000,
         schedule_type="balanced"
     )
 
-    itinerary = create_itinerary(long_trip, activities, prefs)
+    itinerary = create_itinerary(long_trip, varied_long_activities, prefs)
 
     assert len(itinerary) == 14
 
+    for day in itinerary:
+        assert day.total_duration() <= prefs.max_hours_per_day
 
-def test_scheduler_with_all_expensive_activities(basic_trip):
-    '''
-    Test when all activities exceed budget
-    '''
-    expensive_activities = [
-        Activity(f"Expensive {i}", "tour", 2.0, 200.0, None, "Tour")
-        for i in range(5)
-    ]
-
-    prefs = UserPreferences(
-        interests=["tour"],
-        budget=100,  # Can't afford any
-        schedule_type="balanced"
-    )
-
-    itinerary = create_itinerary(basic_trip, expensive_activities, prefs)
-
-    # Should create itinerary structure even if empty
-    assert len(itinerary) == basic_trip.trip_length()
+    cost, count, scheduled = itinerary_totals(itinerary)
+    assert cost <= long_trip.budget
+    assert count == len(set(scheduled))
 
 
-def test_scheduler_with_activities_too_long(single_day_trip, balanced_prefs):
+@pytest.mark.parametrize("activities,expected_total", [
+    ([], 0),
+    ([Activity("Museum", "museum", 2.0, 20.0, (40.7128, -74.0060), "Museum")],
+     1),
+    # Every activity costs more than the whole trip budget
+    ([Activity(f"Expensive {i}", "tour", 2.0, 600.0, None, "Tour")
+      for i in range(5)], 0),
+    # Longer than the 8 hours available per day
+    ([Activity("Long Activity", "museum", 10.0, 20.0, None, "Too long")], 0),
+], ids=["no_activities", "single_activity", "all_too_expensive",
+        "all_too_long"])
+def test_scheduler_pathological_inputs(
+        basic_trip, balanced_prefs, activities, expected_total):
     '''
-    Test when activities are longer than available time
+    Test that the scheduler still builds a well-formed itinerary from
+    degenerate activity lists, scheduling each usable activity at most once
     '''
-    long_activities = [
-        Activity("Long Activity", "museum", 10.0, 20.0, None, "Too long")
-    ]
-
-    balanced_prefs.max_hours_per_day = 5.0
+    itinerary = create_itinerary(basic_trip, activities, balanced_prefs)
 
-    itinerary = create_itinerary(
-        single_day_trip,
-        long_activities,
-        balanced_prefs)
+    # Should create itinerary structure even if empty
+    assert len(itinerary) == basic_trip.trip_length()
 
-    # Activity shouldn't be scheduled
-    assert len(itinerary[0].activities) == 0
+    total_activities = itinerary_totals(itinerary).activity_count
+    assert total_activities == expected_total
 
 
 # ============================================================================
@@ -544,6 +416,7 @@ def test_estimate_travel_time_no_locations():
 # INTEGRATION TESTS
 # ============================================================================
 
+@pytest.mark.slow
 def test_full_itinerary_generation_workflow(sample_activities):
     '''
     Test overall full itinerary generation workflow
@@ -572,23 +445,20 @@ def test_full_itinerary_generation_workflow(sample_activities):
     for day in itinerary:
         assert day.total_duration() <= prefs.max_hours_per_day
 
+    cost, count, scheduled = itinerary_totals(itinerary)
+
     # Verify budget
-    total_cost = sum(day.total_cost() for day in itinerary)
-    assert total_cost <= trip.budget
+    assert cost <= trip.budget
 
     # Verify no duplicates
-    all_activities = []
-    for day in itinerary:
-        all_activities.extend(day.activities)
-    assert len(all_activities) == len(set(all_activities))
+    assert count == len(set(scheduled))
 
 
-def test_itinerary_dates_match_trip_dates(
-        basic_trip, sample_activities, balanced_prefs):
+def test_itinerary_dates_match_trip_dates(basic_trip, default_itinerary):
     '''
     Test that each day in itinerary has correct date
     '''
-    itinerary = create_itinerary(basic_trip, sample_activities, balanced_prefs)
+    itinerary = default_itinerary
 
     expected_date = basic_trip.start_date
     for day in itinerary:
@@ -13,44 +13,45 @@ from engine.scorer import (
 
 # ============================================================================
 # FIXTURES
+# No test modifies these, so each is built once per module
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def museum_activity():
     '''Sample museum activity'''
     return Activity("Art Museum", "museum", 2.0, 15.0,
                     (40.7128, -74.0060), "Modern art")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def expensive_activity():
     '''Expensive activity for cost testing'''
     return Activity("Helicopter Tour", "tour", 2.0, 300.0,
                     (40.7128, -74.0060), "City tour")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def free_activity():
     '''Free activity'''
     return Activity("Central Park", "nature", 1.5, 0.0,
                     (40.7829, -73.9654), "City park")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def long_activity():
     '''Long duration activity'''
     return Activity("Day Trip", "tour", 8.0, 100.0,
                     (40.7128, -74.0060), "Full day tour")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def short_activity():
     '''Short duration activity'''
     return Activity("Quick Visit", "museum", 0.5, 5.0,
                     (40.7128, -74.0060), "Brief tour")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def balanced_prefs():
     '''Balanced preferences'''
     return UserPreferences(
@@ -60,7 +61,7 @@ def balanced_prefs():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def cost_priority_prefs():
     '''Cost-focused preferences'''
     return UserPreferences(
@@ -71,7 +72,7 @@ def cost_priority_prefs():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def relaxed_prefs():
     '''Relaxed schedule preferences'''
     return UserPreferences(
@@ -81,7 +82,7 @@ def relaxed_prefs():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def packed_prefs():
     '''Packed schedule preferences'''
     return UserPreferences(
@@ -196,15 +197,22 @@ def test_score_expensive_activity_without_cost_priority(
 # SCHEDULE TYPE TESTS
 # ============================================================================
 
-def test_score_short_activity_relaxed_schedule(short_activity, relaxed_prefs):
-    '''Test that short activities are favored in relaxed schedule'''
-    long = Activity("Long Museum", "museum", 4.0, 20.0, None, "Museum")
-
-    short_score = score_activity(short_activity, relaxed_prefs)
-    long_score = score_activity(long, relaxed_prefs)
+@pytest.mark.parametrize("schedule_type,favored,other", [
+    ("relaxed", 0.5, 4.0),    # Short activities over long ones
+    ("balanced", 2.0, 4.0),   # Activities in the 1.5-3 hour range
+    ("packed", 2.0, 1.0),     # Activities of 2+ hours fill the day
+])
+def test_score_schedule_type_duration_fit(schedule_type, favored, other):
+    '''Test that each schedule type favors activities of a fitting duration'''
+    prefs = UserPreferences(
+        interests=["museum"],
+        budget=500,
+        schedule_type=schedule_type
+    )
+    favored_activity = Activity("Favored", "museum", favored, 20.0, None, "Museum")
+    other_activity = Activity("Other", "museum", other, 20.0, None, "Museum")
 
-    # Short should score higher in relaxed
-    assert short_score > long_score
+    assert score_activity(favored_activity, prefs) > score_activity(other_activity, prefs)
 
 
 def test_score_relaxed_penalties_long_activities(relaxed_prefs):
@@ -443,6 +451,40 @@ def test_score_all_activities_maintains_activity_objects(balanced_prefs):
         assert activity in output_activities
 
 
+def test_score_all_activities_top_k(balanced_prefs):
+    '''Test that top_k returns the highest scoring prefix of the full ranking'''
+    activities = [
+        Activity("Museum", "museum", 2.0, 20.0, None, "Museum"),
+        Activity("Park", "nature", 1.0, 0.0, None, "Park"),
+        Activity("Restaurant", "food", 1.5, 30.0, None, "Food"),
+        Activity("Tour", "tour", 3.0, 40.0, None, "Tour"),
+    ]
+
+    full = score_all_activities(activities, balanced_prefs)
+    top = score_all_activities(activities, balanced_prefs, top_k=2)
+
+    assert top == full[:2]
+    assert score_all_activities(activities, balanced_prefs, top_k=10) == full
+
+
+def test_score_all_activities_matches_score_activity(balanced_prefs):
+    '''Test that batch scoring agrees with scoring each activity on its own'''
+    activities = [
+        Activity("Museum", "museum", 2.0, 20.0, None, "Museum"),
+        Activity("Tour", "tour", 3.0, 40.0, None, "Tour"),
+        Activity("Park", "nature", 1.0, 0.0, None, "Park"),
+    ]
+    already_scheduled = [
+        Activity("Museum 1", "museum", 2.0, 20.0, None, "M1"),
+        Activity("Museum 2", "Museum", 2.0, 20.0, None, "M2"),
+    ]
+
+    scored = score_all_activities(activities, balanced_prefs, already_scheduled)
+
+    for score, activity in scored:
+        assert score == score_activity(activity, balanced_prefs, already_scheduled)
+
+
 # ============================================================================
 # ANALYZE_CATEGORY_DISTRIBUTION TESTS
 # ============================================================================
@@ -635,14 +677,13 @@ def test_score_consistency():
     assert score1 == score2
 
 
-def test_score_ranges_reasonable():
+@pytest.mark.parametrize("activity", [
+    Activity("Museum", "museum", 2.0, 20.0, None, "Museum"),
+    Activity("Park", "nature", 1.0, 0.0, None, "Park"),
+    Activity("Expensive", "tour", 2.0, 500.0, None, "Tour"),
+], ids=lambda a: a.name)
+def test_score_ranges_reasonable(activity):
     '''Test that scores are generally in reasonable range'''
-    activities = [
-        Activity("Museum", "museum", 2.0, 20.0, None, "Museum"),
-        Activity("Park", "nature", 1.0, 0.0, None, "Park"),
-        Activity("Expensive", "tour", 2.0, 500.0, None, "Tour"),
-    ]
-
     prefs = UserPreferences(
         interests=["museum"],
         budget=500,
@@ -650,7 +691,7 @@ def test_score_ranges_reasonable():
         prioritize_cost=True
     )
 
-    for activity in activities:
-        score = score_activity(activity, prefs)
-        # Scores shouldn't be extremely large (> 1000) or small (< -1000)
-        assert -1000 < score < 1000
+    score = score_activity(activity, prefs)
+
+    # Scores shouldn't be extremely large (> 1000) or small (< -1000)
+    assert -1000 < score < 1000
@@ -1,6 +1,5 @@
 # Unit Tests for Trip Class
 
-import pytest
 from datetime import date
 from models.activity import Activity
 from models.dayplan import DayPlan
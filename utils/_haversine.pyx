@@ -0,0 +1,69 @@
+# cython: language_level=3
+# Compiled Geographic Distance Calculator (Haversine Method)
+'''
+Cython version of utils/haversine.py. Lat/lon values are unpacked into C
+doubles once and the trig runs on libc math, so no Python float objects are
+created in between. Build in place with:
+
+    python setup.py build_ext --inplace
+'''
+
+from array import array
+
+from libc.math cimport sin, cos, sqrt, asin
+
+# Define Earth's radius in kilometers and the degrees -> radians factor
+cdef double R = 6371.0
+cdef double DEG2RAD = 3.141592653589793 / 180.0
+
+
+cdef inline double _haversine(double lat1, double lon1,
+                              double lat2, double lon2) noexcept nogil:
+    '''
+    Haversine formula on raw doubles (decimal degrees in, kilometers out).
+    '''
+    cdef double rlat1 = lat1 * DEG2RAD
+    cdef double rlat2 = lat2 * DEG2RAD
+    cdef double dlat = rlat2 - rlat1
+    cdef double dlon = (lon2 - lon1) * DEG2RAD
+    cdef double h = sin(dlat / 2) ** 2 + cos(rlat1) * cos(rlat2) * sin(dlon / 2) ** 2
+
+    # Clamp rounding noise before asin (NaN fails the comparison and passes through)
+    if h > 1.0:
+        h = 1.0
+
+    return 2 * R * asin(sqrt(h))
+
+
+cpdef double haversine_distance_km(a, b):
+    '''
+    Compute the great-circle distance between two points in kilometers using
+    the Haversine formula. Inputs are (lat, lon) pairs in decimal degrees.
+    Same interface as utils.haversine.haversine_distance_km.
+    '''
+    cdef double lat1, lon1, lat2, lon2
+    lat1, lon1 = a
+    lat2, lon2 = b
+
+    return _haversine(lat1, lon1, lat2, lon2)
+
+
+def haversine_distances_km(origin, const double[:] lats, const double[:] lons):
+    '''
+    Compute the Haversine distances in kilometers from one (lat, lon) point
+    to many points given as parallel float64 buffers (e.g. array('d')).
+    Same interface as utils.haversine.haversine_distances_km.
+    '''
+    cdef double lat1, lon1
+    lat1, lon1 = origin
+
+    cdef Py_ssize_t n = lats.shape[0]
+    distances = array("d", [0.0]) * n
+    cdef double[:] out = distances
+    cdef Py_ssize_t i
+
+    with nogil:
+        for i in range(n):
+            out[i] = _haversine(lat1, lon1, lats[i], lons[i])
+
+    return distances
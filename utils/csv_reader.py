@@ -5,23 +5,26 @@ and parsing it into Activity class objects.
 '''
 
 import csv
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from pathlib import Path
 
 from models.activity import Activity
 
+# Columns read from activity CSVs, in the order they are unpacked
+_COLUMNS = ("name", "category", "duration_hours", "price", "lat", "lon", "description")
+
 # Define helper method for preventing errors on processing floats
 
 
 def _safe_float(value: Optional[str], default: float = 0.0) -> float:
     '''
     Convert string to float safely, return default on empty or bad input.
+    Parses first and only handles the failure case, so well-formed values
+    (the common case) skip the empty/None checks.
     '''
-    if value is None or value == "":
-        return default
     try:
         return float(value)
-    except ValueError:
+    except (TypeError, ValueError):
         return default
 
 # Define a helper method for correctly parsing in latitude and longitude data
@@ -32,29 +35,21 @@ def _safe_coord(lat: Optional[str], lon: Optional[str]) -> Optional[tuple]:
     Convert lat/lon strings to a (lat, lon) tuple or return None if coordinates
     are missing/invalid.
     '''
-    if lat in (None, "") or lon in (None, ""):
-        return None
     try:
         return (float(lat), float(lon))
-    except ValueError:
+    except (TypeError, ValueError):
         return None
 
-# Define method for parsing activity data from input csv
+# Define generator for parsing activity data from input csv one row at a time
 
 
-def load_activities_from_csv(path: str | Path) -> List[Activity]:
+def _iter_activities(path: str | Path) -> Iterator[Activity]:
     '''
-    Read activities from a CSV file and return a list of Activity objects.
-
-    Expected CSV columns (header row):
-    name, category, duration_hours, price, lat, lon, description
-
-    Only 'name', 'category', 'duration_hours' and 'price' are required
-    logically — others are optional.
+    Read activities from a CSV file, yielding one Activity per row. Rows
+    are parsed lazily, so callers that only stream over the activities
+    never hold the whole file in memory. See load_activities_from_csv for
+    the expected columns.
     '''
-    # Initialize empty activities class object to store parsed data
-    activities: List[Activity] = []
-
     # Get path of CSV
     path = Path(path)
 
@@ -63,35 +58,58 @@ def load_activities_from_csv(path: str | Path) -> List[Activity]:
 
     # Open the file at the filepath given
     with path.open(newline="", encoding="utf-8") as infile:
-        reader = csv.DictReader(infile)
-
-        # Read the file row by row and parse data by the different types of
-        # information about an activity
-        for i, row in enumerate(reader, start=1):
+        reader = csv.reader(infile)
+
+        # Read the header once and map each expected column to its position,
+        # so data rows can be indexed directly instead of built into dicts
+        header = next(reader, None)
+        if header is None:
+            return
+
+        positions = {column: i for i, column in enumerate(header)}
+
+        # Columns missing from the header point one past the last column,
+        # which every row is cut or padded to so that field is always blank
+        width = len(header)
+        (name_i, category_i, duration_i, price_i,
+         lat_i, lon_i, description_i) = (
+            positions.get(column, width) for column in _COLUMNS)
+        missing_columns = any(column not in positions for column in _COLUMNS)
+        padded_width = width + 1 if missing_columns else width
+
+        # Read the file row by row (skipping blank lines) and parse data by
+        # the different types of information about an activity
+        for i, row in enumerate((row for row in reader if row), start=1):
+            # Drop extra fields first so none of them is read for a missing
+            # column
+            if missing_columns:
+                del row[width:]
+            if len(row) < padded_width:
+                row += [""] * (padded_width - len(row))
 
             # Require basic information of name and category for an activity
-            name = row.get("name", "").strip()
-            category = row.get("category", "").strip() or "other"
+            name = row[name_i].strip()
+            category = row[category_i].strip() or "other"
 
             # Use "safe" method in case duration or pricing information is
             # missing
-            duration = _safe_float(row.get("duration_hours"), default=1.0)
-            price = _safe_float(row.get("price"), default=0.0)
+            duration = _safe_float(row[duration_i], default=1.0)
+            price = _safe_float(row[price_i], default=0.0)
 
             # Use "safe" method in case location or description information is
             # missing
-            location = _safe_coord(row.get("lat"), row.get("lon"))
-            description = (row.get("description") or "").strip()
+            location = _safe_coord(row[lat_i], row[lon_i])
+            description = row[description_i].strip()
 
             # Skip rows without a name
             if not name:
 
                 raise ValueError(
-                    f"Missing activity name in CSV row {i}: {row}")
+                    f"Missing activity name in CSV row {i}: {dict(zip(header, row))}")
 
             # Create an Activity class object with the parsed information from
             # that row
-            activity = Activity(
+            yield Activity(
                 name=name,
                 category=category,
                 duration=duration,
@@ -100,9 +118,18 @@ def load_activities_from_csv(path: str | Path) -> List[Activity]:
                 description=description
             )
 
-            # Add the activity from the row to the list of activities
-            activities.append(activity)
+# Define method for parsing activity data from input csv
+
+
+def load_activities_from_csv(path: str | Path) -> List[Activity]:
+    '''
+    Read activities from a CSV file and return a list of Activity objects.
 
-    # Return the parsed list of all activities in the input file
+    Expected CSV columns (header row):
+    name, category, duration_hours, price, lat, lon, description
 
-    return activities
+    Only 'name', 'category', 'duration_hours' and 'price' are required
+    logically — others are optional.
+    '''
+    # Parse every row of the input file into a list of activities
+    return list(_iter_activities(path))
@@ -1,11 +1,54 @@
 # Activity Lock and Itinerary Regeneration System
 
-from typing import List, Set, Dict, Optional
+import inspect
+import io
+import json
+import sys
+from array import array
+from itertools import chain
+from typing import List, Set, Dict, Optional, Tuple
 from datetime import date
 from models.activity import Activity
 from models.dayplan import DayPlan
 from models.preferences import UserPreferences
 from models.trip import Trip
+from utils.haversine import (
+    COMPILED_AVAILABLE,
+    haversine_distance_km,
+    haversine_distances_km
+)
+
+# Use orjson for saving itinerary state when it's installed; otherwise fall
+# back to the standard library encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _accepts_distance_fn(func):
+    '''
+    Check whether a scheduler function takes a distance_fn keyword argument,
+    either by name or through **kwargs.
+
+    **Parameters**
+
+        func: *func*
+            Scheduler function to inspect
+
+    **Returns**
+
+        *bool*
+            True if distance_fn can be passed to func, False otherwise
+    '''
+    try:
+        params = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+    return 'distance_fn' in params or any(
+        p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
 
 
 class ItineraryManager:
@@ -25,9 +68,86 @@ class ItineraryManager:
         self.locked_activities: Set[Activity] = set()
         self.locked_per_day: Dict[date,
                                   List[Activity]] = {}  # Specific day locks
+        # Reverse index of locked_per_day: the day each activity is locked to
+        self.activity_day: Dict[Activity, date] = {}
         # User doesn't want these
         self.excluded_activities: Set[Activity] = set()
 
+        # Lowercased name -> activity for CLI lookups. Built in reverse so the
+        # first activity wins when names repeat, matching a linear search
+        self._name_index: Dict[str, Activity] = {
+            a.name.lower(): a for a in reversed(all_activities)}
+
+        # Distinct activity locations and their coordinates, indexed on the
+        # first distance lookup
+        self._location_index: Optional[Dict[Tuple[float, float], int]] = None
+        self._lats = array("d")
+        self._lons = array("d")
+
+        # Origin location -> distances from it to every indexed location,
+        # computed the first time that origin is looked up. Only origins the
+        # scheduler actually routes from get a row, so no regeneration pays
+        # for the full N x N matrix. Locks and exclusions never change the
+        # distances, so rows are kept across regenerations
+        self._distance_rows: Dict[Tuple[float, float], array] = {}
+
+    def _index_locations(self):
+        '''
+        Index the distinct locations of all activities and pack their
+        coordinates, so a distance row can be computed with a single
+        one-to-many call. Index i of the lat/lon columns (and of every
+        distance row) belongs to the location mapped to i.
+
+        **Parameters**
+
+            None
+
+        **Returns**
+
+            None
+        '''
+        locations = list(dict.fromkeys(
+            a.location for a in self.all_activities if a.location))
+        self._location_index = {loc: i for i, loc in enumerate(locations)}
+
+        self._lats = array("d", (lat for lat, _ in locations))
+        self._lons = array("d", (lon for _, lon in locations))
+
+    def distance_km(self, a, b):
+        '''
+        Distance in kilometers between two locations. The first lookup from
+        an activity location computes its distances to every activity
+        location in one call and caches them as that origin's row; later
+        lookups from the same origin read the row. Locations that aren't
+        activity locations are computed directly.
+
+        **Parameters**
+
+            a: *Tuple(float, float)*
+                The (lat, lon) coordinates of the first location.
+
+            b: *Tuple(float, float)*
+                The (lat, lon) coordinates of the second location.
+
+        **Returns**
+
+            *float*
+                Distance between the two locations in kilometers
+        '''
+        if self._location_index is None:
+            self._index_locations()
+
+        j = self._location_index.get(b)
+        if j is None or a not in self._location_index:
+            return haversine_distance_km(a, b)
+
+        row = self._distance_rows.get(a)
+        if row is None:
+            row = haversine_distances_km(a, self._lats, self._lons)
+            self._distance_rows[a] = row
+
+        return row[j]
+
     def lock_activity(self, activity, specific_day=None):
         '''
         Lock an activity to ensure it appears in the itinerary.
@@ -53,9 +173,16 @@ class ItineraryManager:
         self.locked_activities.add(activity)
 
         if specific_day:
+            # An activity is locked to at most one day, so drop any earlier
+            # day lock before adding the new one
+            previous_day = self.activity_day.get(activity)
+            if previous_day is not None:
+                self.locked_per_day[previous_day].remove(activity)
+
             if specific_day not in self.locked_per_day:
                 self.locked_per_day[specific_day] = []
             self.locked_per_day[specific_day].append(activity)
+            self.activity_day[activity] = specific_day
             print(f"🔒 Locked '{activity.name}' for {specific_day}")
         else:
             print(
@@ -84,9 +211,9 @@ class ItineraryManager:
         self.locked_activities.remove(activity)
 
         # Remove from specific day locks if present
-        for day, acts in self.locked_per_day.items():
-            if activity in acts:
-                acts.remove(activity)
+        day = self.activity_day.pop(activity, None)
+        if day is not None:
+            self.locked_per_day[day].remove(activity)
 
         print(f"🔓 Unlocked '{activity.name}'")
         return True
@@ -158,6 +285,10 @@ class ItineraryManager:
             scheduler_func: *func*
                 Function to create itinerary
                 Should accept (trip, activities, prefs, locked_activities)
+                If it also accepts a distance_fn keyword argument, like
+                create_itinerary, it is given the cached distances (unless
+                the compiled haversine extension is built, which computes
+                each distance faster than the cache can look it up)
 
         **Returns**
 
@@ -171,15 +302,19 @@ class ItineraryManager:
         print(f"   Locked activities: {len(self.locked_activities)}")
         print(f"   Excluded activities: {len(self.excluded_activities)}")
 
+        # Only hand the cached distances to schedulers that take them
+        kwargs = {}
+        if not COMPILED_AVAILABLE and _accepts_distance_fn(scheduler_func):
+            kwargs['distance_fn'] = self.distance_km
+
         # Create new itinerary
         self.current_itinerary = scheduler_func(
             self.trip, available, self.prefs, list(
-                self.locked_activities))
+                self.locked_activities), **kwargs)
 
         # Verify locked activities made it in
-        scheduled = set()
-        for day in self.current_itinerary:
-            scheduled.update(day.activities)
+        scheduled = set(chain.from_iterable(
+            day.activities for day in self.current_itinerary))
 
         missing_locked = self.locked_activities - scheduled
         if missing_locked:
@@ -187,7 +322,7 @@ class ItineraryManager:
                 f"⚠️  Warning: Could not fit {
                     len(missing_locked)} locked activities:")
             for act in missing_locked:
-                print(f"   - {act.name} (${act.price}, {act.duration_hours}h)")
+                print(f"   - {act.name} (${act.price}, {act.duration}h)")
 
         return self.current_itinerary
 
@@ -217,7 +352,10 @@ class ItineraryManager:
 
         day = self.current_itinerary[day_index]
 
-        if old_activity not in day.activities:
+        # Find the old activity's slot with a single scan
+        try:
+            slot = day.activities.index(old_activity)
+        except ValueError:
             print(f"❌ '{old_activity.name}' not on day {day_index}")
             return False
 
@@ -226,17 +364,16 @@ class ItineraryManager:
             return False
 
         # Check if new activity fits
-        time_freed = old_activity.duration_hours
-        if new_activity.duration_hours > time_freed:
+        time_freed = old_activity.duration
+        if new_activity.duration > time_freed:
             print(
                 f"⚠️  '{
                     new_activity.name}' is longer than '{
                     old_activity.name}'")
             print(f"   May need to remove other activities")
 
-        # Perform swap
-        day.activities.remove(old_activity)
-        day.activities.append(new_activity)
+        # Perform swap in place, keeping the day's order
+        day.activities[slot] = new_activity
 
         print(
             f"✅ Swapped '{
@@ -281,8 +418,6 @@ class ItineraryManager:
 
             None
         '''
-        import json
-
         state = {
             'destination': self.trip.destination,
             'start_date': self.trip.start_date.isoformat(),
@@ -298,12 +433,35 @@ class ItineraryManager:
             ]
         }
 
-        with open(filename, 'w') as f:
-            json.dump(state, f, indent=2)
+        if ORJSON_AVAILABLE:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(state, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(state, f, indent=2)
 
         print(f"Saved itinerary state to {filename}")
 
 
+# Refinement menu, written in a single call each time it is shown
+_MENU = "\n".join([
+    "",
+    "=" * 60,
+    "ITINERARY REFINEMENT MENU",
+    "=" * 60,
+    "1. View current itinerary",
+    "2. Lock an activity",
+    "3. Unlock an activity",
+    "4. Exclude an activity (don't want it)",
+    "5. Unexclude an activity",
+    "6. Regenerate itinerary",
+    "7. View lock status",
+    "8. Save and finish",
+    "9. Exit without saving",
+    "",
+])
+
+
 def interactive_refinement_cli(manager, scheduler_func):
     '''
     Interactive CLI for refining itinerary with locks and regeneration.
@@ -325,39 +483,28 @@ def interactive_refinement_cli(manager, scheduler_func):
     manager.regenerate_itinerary(scheduler_func)
 
     while True:
-        print("\n" + "=" * 60)
-        print("ITINERARY REFINEMENT MENU")
-        print("=" * 60)
-        print("1. View current itinerary")
-        print("2. Lock an activity")
-        print("3. Unlock an activity")
-        print("4. Exclude an activity (don't want it)")
-        print("5. Unexclude an activity")
-        print("6. Regenerate itinerary")
-        print("7. View lock status")
-        print("8. Save and finish")
-        print("9. Exit without saving")
+        sys.stdout.write(_MENU)
 
         choice = input("\nChoose option (1-9): ").strip()
 
         if choice == '1':
-            # Display itinerary
+            # Display itinerary, buffered so it is written in one go
+            buf = io.StringIO()
             for i, day in enumerate(manager.current_itinerary):
-                print(f"\n📅 Day {i + 1} - {day.date}")
+                buf.write(f"\n📅 Day {i + 1} - {day.date}\n")
                 for j, act in enumerate(day.activities, 1):
                     locked = "🔒" if act in manager.locked_activities else ""
-                    print(
+                    buf.write(
                         f"   {j}. {
                             act.name} {locked} ({
-                            act.duration_hours}h, ${
-                            act.price})")
+                            act.duration}h, ${
+                            act.price})\n")
+            sys.stdout.write(buf.getvalue())
 
         elif choice == '2':
             # Lock activity
             activity_name = input("Enter activity name to lock: ").strip()
-            activity = next(
-                (a for a in manager.all_activities if a.name.lower() == activity_name.lower()),
-                None)
+            activity = manager._name_index.get(activity_name.lower())
             if activity:
                 manager.lock_activity(activity)
             else:
@@ -377,9 +524,7 @@ def interactive_refinement_cli(manager, scheduler_func):
         elif choice == '4':
             # Exclude activity
             activity_name = input("Enter activity name to exclude: ").strip()
-            activity = next(
-                (a for a in manager.all_activities if a.name.lower() == activity_name.lower()),
-                None)
+            activity = manager._name_index.get(activity_name.lower())
             if activity:
                 manager.exclude_activity(activity)
             else:
@@ -402,14 +547,16 @@ def interactive_refinement_cli(manager, scheduler_func):
             print("✅ Itinerary regenerated!")
 
         elif choice == '7':
-            # Show status
+            # Show status, buffered so it is written in one go
             status = manager.get_locked_status()
-            print(f"\n🔒 Locked: {status['locked_count']}")
+            buf = io.StringIO()
+            buf.write(f"\n🔒 Locked: {status['locked_count']}\n")
             for act in status['locked_activities']:
-                print(f"   - {act.name}")
-            print(f"\n🚫 Excluded: {status['excluded_count']}")
+                buf.write(f"   - {act.name}\n")
+            buf.write(f"\n🚫 Excluded: {status['excluded_count']}\n")
             for act in status['excluded_activities']:
-                print(f"   - {act.name}")
+                buf.write(f"   - {act.name}\n")
+            sys.stdout.write(buf.getvalue())
 
         elif choice == '8':
             # Save and exit
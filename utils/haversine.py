@@ -1,6 +1,10 @@
 # Geographic Distance Calculator (Haversine Method)
 
-from math import radians, sin, cos, sqrt, atan2
+from array import array
+from math import pi, sin, cos, sqrt, asin
+
+# Degrees -> radians factor (same value math.radians multiplies by)
+_DEG2RAD = pi / 180.0
 
 
 def haversine_distance_km(a, b):
@@ -27,7 +31,10 @@ def haversine_distance_km(a, b):
     lat2, lon2 = b
 
     # convert decimal degrees to radians
-    rlat1, rlon1, rlat2, rlon2 = map(radians, (lat1, lon1, lat2, lon2))
+    rlat1 = lat1 * _DEG2RAD
+    rlon1 = lon1 * _DEG2RAD
+    rlat2 = lat2 * _DEG2RAD
+    rlon2 = lon2 * _DEG2RAD
 
     # Calculate latitudinal distance
     dlat = rlat2 - rlat1
@@ -40,7 +47,72 @@ def haversine_distance_km(a, b):
 
     # Apply Haversine formula
     h = sin(dlat / 2) ** 2 + (cos(rlat1) * cos(rlat2) * sin(dlon / 2) ** 2)
-    distance = 2 * R * atan2(sqrt(h), sqrt(1 - h))
+    # Rounding can push sqrt(h) just past 1 for near-antipodal points, so
+    # clamp it before asin (min keeps NaN inputs as NaN, since NaN never
+    # compares smaller)
+    distance = 2 * R * asin(min(sqrt(h), 1.0))
 
     # Return calculated distance
     return distance
+
+
+def haversine_distances_km(origin, lats, lons):
+    """
+    Compute the Haversine distances in kilometers from one point to many
+    points at once. The destination points are given as parallel float64
+    latitude and longitude buffers such as array('d') (the compiled version
+    requires buffers; lists only work in pure Python). NaN coordinates give
+    NaN distances.
+
+    **Parameters**
+
+        origin: *Tuple(float, float)*
+            The latitude and longitude coordinates of the starting location.
+
+        lats: *array('d')*
+            Latitudes of the destination points in decimal degrees.
+
+        lons: *array('d')*
+            Longitudes of the destination points in decimal degrees.
+
+    **Returns**
+
+        distances: *array('d')*
+            distances[i] is the distance in kilometers from origin to
+            (lats[i], lons[i]).
+
+    """
+    # Convert the origin once; its cosine is shared by every pair
+    rlat1 = origin[0] * _DEG2RAD
+    rlon1 = origin[1] * _DEG2RAD
+    cos_rlat1 = cos(rlat1)
+
+    # Define Earth's radius in kilometers
+    R = 6371.0
+
+    distances = array("d", [0.0]) * len(lats)
+
+    for i in range(len(lats)):
+        rlat2 = lats[i] * _DEG2RAD
+        dlat = rlat2 - rlat1
+        dlon = lons[i] * _DEG2RAD - rlon1
+
+        h = sin(dlat / 2) ** 2 + (cos_rlat1 * cos(rlat2) * sin(dlon / 2) ** 2)
+        distances[i] = 2 * R * asin(min(sqrt(h), 1.0))
+
+    return distances
+
+
+# Keep a handle on the pure Python versions, then swap in the compiled
+# versions from utils/_haversine.pyx if they have been built (see setup.py)
+py_haversine_distance_km = haversine_distance_km
+py_haversine_distances_km = haversine_distances_km
+
+try:
+    from utils._haversine import (
+        haversine_distance_km,
+        haversine_distances_km
+    )
+    COMPILED_AVAILABLE = True
+except ImportError:
+    COMPILED_AVAILABLE = False